@@ -1,15 +1,24 @@
-from collections import defaultdict
-from io import BytesIO
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 
+import numpy as np
 import UnityPy
 from UnityPy.classes import Sprite, Texture2D
 from UnityPy.files import ObjectReader
 from tqdm import tqdm
 from ..shared import meta_cursor, state
 from . import logger
+import mmap
+import os
 import struct
-import sys
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; decryption falls back to the NumPy path
+    njit = None
 
 ABKey = bytes(
     [
@@ -17,22 +26,20 @@ ABKey = bytes(
     ])
 
 def generate_keys(base_keys: bytes, key: int) -> bytes:
-    base_len = len(base_keys)
-    keys = bytearray(base_len * 8)
-
-    # Convert int key to bytes (little-endian)
+    # '<Q' is explicitly little-endian regardless of host byte order, so no
+    # sys.byteorder handling is needed to match C# BitConverter
     key_bytes = struct.pack('<Q', key & 0xFFFFFFFFFFFFFFFF)
-    # If system is big-endian, reverse to match C# BitConverter behavior
-    if sys.byteorder != 'little':
-        key_bytes = key_bytes[::-1]
 
-    for i in range(base_len):
-        b = base_keys[i]
-        base_offset = i * 8
-        for j in range(8):
-            keys[base_offset + j] = b ^ key_bytes[j]
+    # Each base key byte expands to 8 keystream bytes XORed with the key
+    base = np.frombuffer(base_keys, dtype=np.uint8)
+    kb = np.frombuffer(key_bytes, dtype=np.uint8)
+    return (base[:, None] ^ kb[None, :]).tobytes()
+
 
-    return bytes(keys)
+@lru_cache(maxsize=4096)
+def _generate_keys_cached(key: int) -> bytes:
+    # Many DB rows share the same key, so memoize the expanded keystream
+    return generate_keys(ABKey, key)
 
 def list_valid_kinds():
     if not state.appdata_path.exists():
@@ -48,83 +55,200 @@ def list_valid_kinds():
     logger.info(f"Valid values of m: {kinds}")
     return kinds
 
-def decrypt_uma_assetbundle(input_path: Path, keys: bytes, base_keys_len: int):
+if njit is not None:
+
+    @njit(cache=True, boundscheck=False)
+    def _xor_decrypt(buf, keys, header):
+        # XOR the bundle body in place against the keystream. The keystream
+        # is indexed by absolute file offset; walking whole key periods keeps
+        # the modulo out of the hot loop so LLVM can vectorize the inner XOR.
+        klen = keys.size
+        n = buf.size
+        i = header
+        k = header % klen
+        # finish the key period straddling the header boundary
+        while i < n and k != 0:
+            buf[i] ^= keys[k]
+            i += 1
+            k += 1
+            if k == klen:
+                k = 0
+        # whole periods
+        while i + klen <= n:
+            for j in range(klen):
+                buf[i + j] ^= keys[j]
+            i += klen
+        # tail
+        for j in range(n - i):
+            buf[i + j] ^= keys[j]
+
+else:
+    _xor_decrypt = None
+
+
+def decrypt_uma_assetbundle(input_path: Path, keys: bytes) -> bytes:
     HEADER_SIZE = 256
-    with open(input_path, "rb") as f_in:
-        data = f_in.read()
-        decrypted = bytearray(data)
-        total_len = len(decrypted)
-        for i in range(HEADER_SIZE, total_len):
-            decrypted[i] ^= keys[i % (base_keys_len * 8)]
-        return decrypted
+    # mmap shares pages with the OS cache, so the only userspace copy made
+    # here is the writable buffer the XOR runs over
+    with open(input_path, "rb") as f_in, mmap.mmap(
+        f_in.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        buf = np.frombuffer(mm, dtype=np.uint8).copy()
+
+    key_arr = np.frombuffer(keys, dtype=np.uint8)
+    if _xor_decrypt is not None:
+        _xor_decrypt(buf, key_arr, HEADER_SIZE)
+    else:
+        # The keystream is indexed by absolute file offset, so shift it to
+        # the phase of the first body byte before tiling it over the buffer
+        phase = np.roll(key_arr, -(HEADER_SIZE % key_arr.size))
+        body = buf[HEADER_SIZE:]
+        body ^= np.resize(phase, body.size)
+    return buf.tobytes()
 
 def assets_dump(args):
     if not state.appdata_path.exists():
         logger.error(f"AppData folder does not exist: {state.storage_path}")
         return
 
+    params = []
     where_query = ""
     if args.kind:
         # to filter out, add  AND n LIKE '%chara_stand______1_____' for standing portraits only
-        where_query = "WHERE m IN ({})".format(",".join([f"'{k}'" for k in args.kind]))
+        where_query = "WHERE m IN ({})".format(",".join("?" * len(args.kind)))
+        params.extend(args.kind)
 
     offset_query = ""
     if args.skip_i:
-        offset_query = "OFFSET {}".format(args.skip_i)
+        offset_query = "LIMIT -1 OFFSET ?"
 
     query = "SELECT n, h, m, e FROM a {} ORDER BY i {}".format(where_query, offset_query)
 
-    with meta_cursor() as cursor:
-        cursor.execute(query)
-        rows = cursor.fetchall()
-
     dat_path = state.appdata_path / "dat"
     assets_path = state.storage_path / "assets"
 
     skipped = 0
-    for i, (row_path, row_hash, row_kind, key) in enumerate(
-        tqdm(rows, desc="Processing DB rows", unit="row", total=len(rows))
-    ):
-        fKey = generate_keys(ABKey, key)
-        
-        if row_path.startswith("/"):
-            continue
-
-        path = Path(row_path)
-        dump_path = assets_path / path
-        if args.skip_existing and dump_path.exists():
-            skipped += 1
-            continue
-
-        appdata_file = dat_path / row_hash[:2] / row_hash
-        if not appdata_file.exists():
-            skipped += 1
-            continue
-
-        dump_path.mkdir(parents=True, exist_ok=True)
-
-        try:
-            decrypted_data = decrypt_uma_assetbundle(appdata_file, fKey, len(ABKey))
-        except Exception as e:
-            logger.error(f"Failed to decrypt {row_hash}: {e}")
-            skipped += 1
-            continue
-    
-        try:
-            pack = UnityPy.load(BytesIO(decrypted_data))
-            class_objects = defaultdict(list)
-            for obj in pack.objects:
-                class_objects[obj.get_class()].append(obj)
-
-            if Texture2D in class_objects:
-                texture_dump(class_objects, dump_path, row_kind)
-            
-        except Exception as e:
-            logger.error(f"Failed to load: {row_hash} ({e})")
-            skipped += 1
-            continue
-
-    logger.debug(f"finished processing {i} DB rows (skipped {skipped})")
+    with meta_cursor() as cursor:
+        (count,) = cursor.execute(
+            "SELECT COUNT(*) FROM a {}".format(where_query), params
+        ).fetchone()
+        if args.skip_i:
+            count = max(count - args.skip_i, 0)
+            params.append(args.skip_i)
+
+        cursor.execute(query, params)
+
+        # Pre-filter in one pass: drop absolute-path rows and precompute the
+        # output and blob paths so workers receive a clean work list
+        work = [
+            (p, h, m, k, assets_path / p, dat_path / h[:2] / h)
+            for (p, h, m, k) in cursor
+            if not p.startswith("/")
+        ]
+
+        existing_dat = _existing_dat_files(dat_path)
+        existing_outputs = (
+            _existing_output_dirs(assets_path) if args.skip_existing else None
+        )
+
+        # The per-row work (read, decrypt, UnityPy parse, PNG save) is
+        # independent, so fan rows out across cores; workers log their own
+        # errors and report back how many rows they skipped
+        worker = partial(_process_row, skip_existing=args.skip_existing)
+        with ProcessPoolExecutor(
+            initializer=_init_worker, initargs=(existing_dat, existing_outputs)
+        ) as executor:
+            for result in tqdm(
+                executor.map(worker, work, chunksize=16),
+                desc="Processing DB rows",
+                unit="row",
+                total=len(work),
+            ):
+                skipped += result
+
+    logger.debug(f"finished processing {count} DB rows (skipped {skipped})")
+
+
+def _existing_dat_files(dat_path: Path) -> set[str]:
+    """Collect dat file names in one scandir walk instead of a stat per row."""
+    existing = set()
+    if not dat_path.exists():
+        return existing
+
+    for bucket in os.scandir(dat_path):
+        if bucket.is_dir():
+            for entry in os.scandir(bucket.path):
+                existing.add(entry.name)
+
+    return existing
+
+
+def _existing_output_dirs(assets_path: Path) -> set[str]:
+    """Collect already-dumped output folders in one walk instead of a stat per row."""
+    if not assets_path.exists():
+        return set()
+
+    return {
+        p.relative_to(assets_path).as_posix()
+        for p in assets_path.rglob("*")
+        if p.is_dir()
+    }
+
+
+# Set once per pool worker by _init_worker; both sets are built by the
+# parent so workers never have to stat the dat or assets folders themselves
+_existing_dat: set[str] | None = None
+_existing_outputs: set[str] | None = None
+
+
+def _init_worker(existing_dat: set[str], existing_outputs: set[str] | None):
+    global _existing_dat, _existing_outputs
+    _existing_dat = existing_dat
+    _existing_outputs = existing_outputs
+
+
+def _process_row(item, skip_existing: bool) -> int:
+    """Decrypt and dump one pre-filtered row, returning the number of rows skipped."""
+    row_path, row_hash, row_kind, key, dump_path, appdata_file = item
+
+    if skip_existing:
+        if _existing_outputs is not None:
+            if row_path in _existing_outputs:
+                return 1
+        elif dump_path.exists():
+            return 1
+
+    if _existing_dat is not None:
+        if row_hash not in _existing_dat:
+            return 1
+    elif not appdata_file.exists():
+        return 1
+
+    dump_path.mkdir(parents=True, exist_ok=True)
+
+    fKey = _generate_keys_cached(key)
+    try:
+        decrypted_data = decrypt_uma_assetbundle(appdata_file, fKey)
+    except Exception as e:
+        logger.error(f"Failed to decrypt {row_hash}: {e}")
+        return 1
+
+    try:
+        # decrypt_uma_assetbundle returns bytes, which UnityPy accepts
+        # directly; no need for an intermediate BytesIO stream
+        pack = UnityPy.load(decrypted_data)
+        class_objects = defaultdict(list)
+        for obj in pack.objects:
+            class_objects[obj.get_class()].append(obj)
+
+        if Texture2D in class_objects:
+            texture_dump(class_objects, dump_path, row_kind)
+
+    except Exception as e:
+        logger.error(f"Failed to load: {row_hash} ({e})")
+        return 1
+
+    return 0
 
 def texture_dump(class_objects: dict[type, list[ObjectReader]], path: Path, kind: str):
     texture_images = []
@@ -149,14 +273,28 @@ def texture_dump(class_objects: dict[type, list[ObjectReader]], path: Path, kind
 
         image, image_name = texture_images[0]
         images.append((image, image_name))
-        for i, sprite_obj in enumerate(sprite_objs):
-            sprite = sprite_obj.parse_as_dict()
-            if rect := sprite.get("m_Rect"):
-                x, y, h, w = rect["x"], rect["y"], rect["height"], rect["width"]
-                # PIL and Unity treat height as starting from opposite sides
-                sprite_img = image.crop(
-                    (x, image.height - y - h, x + w, image.height - y)
+        parsed = [sprite_obj.parse_as_dict() for sprite_obj in sprite_objs]
+        sprites = [(i, s) for i, s in enumerate(parsed) if s.get("m_Rect")]
+        if sprites:
+            rects = np.array(
+                [
+                    [s["m_Rect"][k] for k in ("x", "y", "width", "height")]
+                    for _, s in sprites
+                ],
+                dtype=np.float32,
+            )
+            # PIL and Unity treat height as starting from opposite sides;
+            # compute every crop box in one vectorized pass
+            boxes = np.column_stack(
+                (
+                    rects[:, 0],
+                    image.height - rects[:, 1] - rects[:, 3],
+                    rects[:, 0] + rects[:, 2],
+                    image.height - rects[:, 1],
                 )
+            )
+            for (i, sprite), box in zip(sprites, boxes):
+                sprite_img = image.crop(tuple(box))
                 sprite_name = sprite.get("m_Name")
                 if not sprite_name:
                     sprite_name = f"{i}_{image_name}"
@@ -169,19 +307,28 @@ def texture_dump(class_objects: dict[type, list[ObjectReader]], path: Path, kind
 
             images.append((image, image_name))
 
-    names = set()
-    for i, (image, image_name) in enumerate(images):
+    seen = Counter()
+    images_to_save = []
+    for image, image_name in images:
         # PIL fails to save if the file has no extension
         image_name = Path(image_name)
         if not image_name.suffix:
             image_name = image_name.with_suffix(".png")
 
-        if image_name in names:
+        # Each duplicate stem gets its own monotonically increasing suffix,
+        # unlike the old enumerate index which could itself collide
+        count = seen[image_name.stem]
+        seen[image_name.stem] += 1
+        if count:
             logger.debug("found duplicate image name: %s %s", path, image_name)
-            image_name = image_name.with_stem(f"{image_name.stem}_{i}")
+            image_name = image_name.with_stem(f"{image_name.stem}_{count}")
+
+        images_to_save.append((image, image_name))
 
-        image.save(path / image_name)
-        names.add(image_name)
+    # PNG encoding releases the GIL, so overlapping the saves hides most of
+    # the per-image encode latency
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda item: item[0].save(path / item[1]), images_to_save))
 
 def image_resize(name: str, kind: str):
     resize = None
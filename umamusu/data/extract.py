@@ -3,6 +3,12 @@ import json
 from ..shared import Status, master_cursor, state
 from . import logger
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; output falls back to the stdlib json module
+    orjson = None
+
 def characard_extract(args):
     with master_cursor() as cursor:
         cursor.execute("""
@@ -48,41 +54,37 @@ def supportcard_extract(args):
         """)
         stat_name_map = {row[0]: row[1].lower().replace(' ', '_') for row in cursor.fetchall()}
 
-        # Step 3: Load support_card_effect data
-        # We find the max value across all limit_lv columns, ignoring -1
+        # Steps 3+4: Aggregate effect stats inside SQLite. The scalar MAX
+        # picks the per-row best across the limit_lv columns, the UNION ALL
+        # folds the (additive) unique effects into the same stream, and the
+        # GROUP BY sums everything per (card, stat type) before any rows
+        # cross into Python.
         cursor.execute("""
-            SELECT id, type,
-                    MAX(
-                        limit_lv5, limit_lv10, limit_lv15, limit_lv20, limit_lv25,
-                        limit_lv30, limit_lv35, limit_lv40, limit_lv45, limit_lv50
-                    ) AS max_value
-            FROM support_card_effect_table
+            SELECT id, type, SUM(value)
+            FROM (
+                SELECT id, type,
+                        MAX(
+                            limit_lv5, limit_lv10, limit_lv15, limit_lv20, limit_lv25,
+                            limit_lv30, limit_lv35, limit_lv40, limit_lv45, limit_lv50
+                        ) AS value
+                FROM support_card_effect_table
+                UNION ALL
+                SELECT id, type_0, value_0
+                FROM support_card_unique_effect
+                WHERE type_0 IS NOT NULL AND type_0 != -1 AND value_0 IS NOT NULL
+                UNION ALL
+                SELECT id, type_1, value_1
+                FROM support_card_unique_effect
+                WHERE type_1 IS NOT NULL AND type_1 != -1 AND value_1 IS NOT NULL
+            )
+            GROUP BY id, type
         """)
-        effect_rows = cursor.fetchall()
 
-        # Aggregate main effect stats
         effect_stats = {}
-        for card_id, stat_type, max_value in effect_rows:
-            if card_id not in effect_stats:
-                effect_stats[card_id] = {}
+        for card_id, stat_type, total in cursor.fetchall():
             stat_name = stat_name_map.get(stat_type, f"type_{stat_type}")
-            effect_stats[card_id][stat_name] = effect_stats[card_id].get(stat_name, 0) + max_value
-
-        # Step 4: Load unique effects (additive)
-        cursor.execute("""
-            SELECT id, type_0, value_0, type_1, value_1
-            FROM support_card_unique_effect
-        """)
-        unique_rows = cursor.fetchall()
-
-        for card_id, t0, v0, t1, v1 in unique_rows:
-            if card_id not in effect_stats:
-                effect_stats[card_id] = {}
-            for t, v in ((t0, v0), (t1, v1)):
-                if t is None or v is None or t == -1:
-                    continue
-                stat_name = stat_name_map.get(t, f"type_{t}")
-                effect_stats[card_id][stat_name] = effect_stats[card_id].get(stat_name, 0) + v
+            stats = effect_stats.setdefault(card_id, {})
+            stats[stat_name] = stats.get(stat_name, 0) + total
 
     # Step 5: Combine results
     support_cards = []
@@ -206,7 +208,14 @@ def data_extract(args):
 
         for data_filename, data in extractor(args):
             data_file = data_path / data_filename
-            with data_file.open("w+") as file:
-                json.dump(data, file, indent=2)
+            if orjson is not None:
+                option = orjson.OPT_INDENT_2 if args.pretty else 0
+                data_file.write_bytes(orjson.dumps(data, option=option))
+            else:
+                with data_file.open("w+", encoding="utf8") as file:
+                    if args.pretty:
+                        json.dump(data, file, indent=2, ensure_ascii=False)
+                    else:
+                        json.dump(data, file, separators=(",", ":"), ensure_ascii=False)
 
             logger.info(f"Extracted '{kind}' data to '{data_file}'!", status=Status.OK)
@@ -1,8 +1,10 @@
 import enum
 import logging
+import re
 import apsw
 from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -48,7 +50,8 @@ def master_cursor():
             raise FileNotFoundError(f"master DB path does not exist: {_master_path}")
 
         _master_conn = apsw.Connection(str(_master_path))
-    
+        _master_conn.setbusytimeout(5000)
+
     return _db_cursor(_master_conn)
 
 GlobalDBKey = bytes([
@@ -68,7 +71,12 @@ def gen_final_key(key: bytes) -> bytes:
 
     # XOR each byte in key with DBBaseKey[i % 13]
     return bytes((key[i] ^ DBBaseKey[i % 13]) for i in range(len(key)))
-import sqlite3
+
+
+# The meta DB key never changes at runtime, so derive the hex string once
+_META_HEXKEY = gen_final_key(GlobalDBKey).hex()
+
+
 def meta_cursor():
     """Return a context-managed APSW cursor for the meta database."""
     global _meta_conn
@@ -79,9 +87,12 @@ def meta_cursor():
             _meta_path = state.appdata_path / "meta"
         if not _meta_path.exists():
             raise FileNotFoundError(f"meta DB path does not exist: {_meta_path}")
+        # apsw caches prepared statements by SQL text, so as long as queries
+        # use ? placeholders (rather than interpolated values) they are only
+        # parsed once per connection
         _meta_conn = apsw.Connection(str(_meta_path))
-    
-    _meta_conn.pragma("hexkey",gen_final_key(GlobalDBKey).hex())
+        _meta_conn.setbusytimeout(5000)
+        _meta_conn.pragma("hexkey", _META_HEXKEY)
 
     return _db_cursor(_meta_conn)
 
@@ -103,15 +114,15 @@ class CustomAdapter(logging.LoggerAdapter):
     BOLD = "\033[1m"
     UNDERLINE = "\033[4m"
 
+    _COLORS = {Status.OK: OKGREEN, Status.ERR: FAIL}
+
     def process(self, msg, kwargs):
-        if status := kwargs.pop("status", None):
-            if status == Status.OK:
-                return f"{self.OKGREEN}{msg}{self.ENDC}", kwargs
-            elif status == Status.ERR:
-                return f"{self.FAIL}{msg}{self.ENDC}", kwargs
+        if color := self._COLORS.get(kwargs.pop("status", None)):
+            return f"{color}{msg}{self.ENDC}", kwargs
         return msg, kwargs
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: str):
     """Get a logger, writing to file if state.log_path is set."""
     logger = logging.getLogger(name)
@@ -135,45 +146,69 @@ class AppDataException(Exception):
         super().__init__("Unable to find AppData folder")
 
 
+_CREATE_RE = re.compile(
+    r"^\s*CREATE\s+(?:VIRTUAL\s+|UNIQUE\s+)?(?:TABLE|INDEX|VIEW|TRIGGER)\s+"
+    r"(?:IF\s+NOT\s+EXISTS\s+)?",
+    re.IGNORECASE,
+)
+
+
+def _qualify_create(sql: str, schema: str) -> str:
+    """Rewrite a sqlite_master CREATE statement to build its object in `schema`."""
+    match = _CREATE_RE.match(sql)
+    if match is None:
+        # Fail loudly rather than silently executing the statement against main
+        raise ValueError(f"unsupported schema statement: {sql.splitlines()[0]!r}")
+    return f"{sql[:match.end()]}{schema}.{sql[match.end():]}"
+
+
 def extract_db(_meta_conn):
+    """Copy the (decrypted) meta DB into a plain ./backup.db via ATTACH."""
     try:
         backup_path = Path("./backup.db")
         if backup_path.exists():
             backup_path.unlink()
 
-        dest = sqlite3.connect(str(backup_path))
-        dest_cursor = dest.cursor()
-        src_cursor = _meta_conn.cursor()
-
-        # 1️⃣ Copy schema (skip internal sqlite_* objects)
-        for (sql,) in src_cursor.execute(
-            "SELECT sql FROM sqlite_master "
-            "WHERE sql NOT NULL "
-            "AND type IN ('table','index','trigger','view') "
-            "AND name NOT LIKE 'sqlite_%'"
-        ):
-            dest_cursor.execute(sql)
-
-        # 2️⃣ Copy data table by table (skip internal sqlite_* tables)
-        for (table_name,) in src_cursor.execute(
-            "SELECT name FROM sqlite_master "
-            "WHERE type='table' AND name NOT LIKE 'sqlite_%'"
-        ):
-            columns = [
-                r[1]
-                for r in src_cursor.execute(f"PRAGMA table_info({table_name})")
-            ]
-            colnames = ", ".join(columns)
-            placeholders = ", ".join("?" * len(columns))
-            for row in src_cursor.execute(f"SELECT * FROM {table_name}"):
-                dest_cursor.execute(
-                    f"INSERT INTO {table_name} ({colnames}) VALUES ({placeholders})",
-                    row,
-                )
-
-        dest.commit()
-        dest.close()
+        cursor = _meta_conn.cursor()
+        # KEY '' is required: without it sqlite3mc attaches the new DB with
+        # the main connection's key and the "unencrypted" backup comes out
+        # encrypted
+        cursor.execute("ATTACH DATABASE ? AS backup KEY ''", (str(backup_path),))
+        try:
+            # Throwaway destination: skip fsyncs and keep the journal in memory
+            cursor.execute("PRAGMA backup.synchronous=OFF")
+            cursor.execute("PRAGMA backup.journal_mode=MEMORY")
+
+            objects = cursor.execute(
+                "SELECT type, name, sql FROM sqlite_master "
+                "WHERE sql NOT NULL "
+                "AND type IN ('table','index','trigger','view') "
+                "AND name NOT LIKE 'sqlite_%'"
+            ).fetchall()
+
+            try:
+                cursor.execute("BEGIN")
+                # Tables and their rows go first; the row transfer stays
+                # inside SQLite in C, nothing is marshalled through Python
+                for type_, name, sql in objects:
+                    if type_ != "table":
+                        continue
+                    cursor.execute(_qualify_create(sql, "backup"))
+                    cursor.execute(
+                        f'INSERT INTO backup."{name}" SELECT * FROM main."{name}"'
+                    )
+
+                # Indexes, views, and triggers afterwards, so index builds see
+                # the bulk-loaded rows and no trigger fires mid-copy
+                for type_, name, sql in objects:
+                    if type_ != "table":
+                        cursor.execute(_qualify_create(sql, "backup"))
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+        finally:
+            cursor.execute("DETACH DATABASE backup")
 
     except Exception as e:
-        print(f"Warning: Failed to create unencrypted backup: {e}")
-    
\ No newline at end of file
+        print(f"Warning: Failed to create unencrypted backup: {e}")
\ No newline at end of file